@@ -5,19 +5,87 @@ FastAPI server that bridges the frontend chatbot with the quantum optimization e
 This creates a REST API that the frontend can call to get real portfolio optimizations.
 """
 
-from fastapi import FastAPI, HTTPException
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, confloat
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, Optional, List, Dict, Any, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from enum import Enum
+import asyncio
+import hashlib
+import json
+import logging
+import os
 import random
 import math
+import sys
 from datetime import datetime
 
+from cache import (
+    CacheBackend,
+    DEFAULT_LOCK_TTL_SECONDS,
+    DEFAULT_TTL_SECONDS,
+    create_cache,
+    decode_floats,
+    encode_floats,
+)
+
+# Heavy numeric libraries (NumPy) are imported on first use by the
+# subsystems that need them, so each worker can answer health checks as
+# soon as possible.
+
+logger = logging.getLogger("quantumcoach")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the risk-model snapshot and templates, then warm heavier subsystems in the background."""
+    started = time.perf_counter()
+    load_risk_model()
+    STARTUP_REPORT["snapshot_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    started = time.perf_counter()
+    compile_explanation_templates()
+    STARTUP_REPORT["templates_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    startup_ms = sum(STARTUP_REPORT[phase] for phase in ("import_ms", "snapshot_ms", "templates_ms"))
+    STARTUP_REPORT["startup_ms"] = round(startup_ms, 2)
+    STARTUP_REPORT["within_budget"] = startup_ms <= STARTUP_BUDGET_MS
+    if not STARTUP_REPORT["within_budget"]:
+        logger.warning(
+            "Startup took %.1f ms, over the %.1f ms budget", startup_ms, STARTUP_BUDGET_MS
+        )
+
+    warmup_task = asyncio.create_task(warm_up())
+    try:
+        yield
+    finally:
+        # Wait for the cancelled warm-up so no threadpool solve is still
+        # using the cache connection when it is closed.
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+        if _solver_batcher is not None:
+            await _solver_batcher.close()
+        shutdown_solver_executor()
+        if _solver_cache is not None:
+            _solver_cache.close()
+
+
 app = FastAPI(
     title="QuantumCoach API",
     description="Quantum Portfolio Optimization API for Spanish Retail Investors",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend access
@@ -30,6 +98,18 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """422 like FastAPI's default, minus NaN/Infinity inputs that JSON cannot carry."""
+    errors = []
+    for error in exc.errors():
+        value = error.get("input")
+        if isinstance(value, float) and not math.isfinite(value):
+            error = {**error, "input": str(value)}
+        errors.append(error)
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
+
 # =============================================================================
 # MODELS & ENUMS
 # =============================================================================
@@ -98,6 +178,26 @@ class ChatResponse(BaseModel):
     suggested_actions: List[str] = []
 
 
+class StressPortfolio(BaseModel):
+    """Portfolio to stress: a predefined profile or custom weights."""
+    profile: Optional[RiskProfile] = None
+    weights: Optional[Dict[str, confloat(ge=0, allow_inf_nan=False)]] = Field(
+        None, description="Ticker -> weight (%), long-only"
+    )
+
+
+class StressRequest(BaseModel):
+    """Request for scenario stress testing."""
+    portfolios: List[StressPortfolio] = Field(..., min_length=1, max_length=5000)
+    scenarios: Optional[List[str]] = Field(None, description="Scenario ids (default: all)")
+    simulations: int = Field(0, ge=0, le=10000, description="Extra random factor scenarios")
+    seed: Optional[int] = None
+    capital: float = Field(1000.0, gt=0, le=1e9, allow_inf_nan=False, description="EUR invested per portfolio")
+    per_scenario_summary: bool = Field(
+        False, description="Also summarize each simulated scenario across portfolios"
+    )
+
+
 # =============================================================================
 # ASSET DATABASE (Simulated from GitHub repo config/assets.py)
 # =============================================================================
@@ -460,31 +560,806 @@ def detect_intent(message: str) -> Dict[str, Any]:
         return {"profile": "equilibrado_global", "type": "default_portfolio"}
 
 
-def generate_explanation(profile_name: str, metrics: PortfolioMetrics, is_inflation: bool = False) -> str:
-    """Generate natural language explanation for the portfolio."""
-    
-    profile = PORTFOLIO_PROFILES.get(profile_name, {})
-    
-    base_explanation = f"""He analizado tu solicitud usando el algoritmo QAOA (Quantum Approximate Optimization Algorithm). 
+# =============================================================================
+# EXPLANATION TEMPLATES
+# =============================================================================
+
+# Spanish inflation (IPC) used for the inflation-hedge commentary.
+INFLATION_SPAIN = 3.2
 
-📊 **Perfil detectado**: {profile.get('name', 'Equilibrado')}
-{profile.get('description', '')}
+# Per-language explanation templates. Profile slots ({name}, {description})
+# are filled once at startup; metric slots are filled per request. Profile
+# text comes from "profiles" when translated, otherwise PORTFOLIO_PROFILES.
+EXPLANATION_TEMPLATES = {
+    "es": {
+        "default_name": "Equilibrado",
+        "base": """He analizado tu solicitud usando el algoritmo QAOA (Quantum Approximate Optimization Algorithm). 
+
+📊 **Perfil detectado**: {name}
+{description}
 
 💡 **Métricas clave**:
-- Rentabilidad esperada: {metrics.expected_return}% anual
-- Volatilidad: {metrics.volatility}%
-- Ratio de Sharpe: {metrics.sharpe_ratio} (a mayor valor, mejor relación rentabilidad/riesgo)
-- VaR 95%: {metrics.var_95}% (pérdida máxima probable en 95% de casos)
-"""
+- Rentabilidad esperada: {expected_return}% anual
+- Volatilidad: {volatility}%
+- Ratio de Sharpe: {sharpe_ratio} (a mayor valor, mejor relación rentabilidad/riesgo)
+- VaR 95%: {var_95}% (pérdida máxima probable en 95% de casos)
+""",
+        "inflation": """
+🎯 **Para batir la inflación española** (actualmente ~{inflation}%), esta cartera tiene 
+una rentabilidad esperada de {expected_return}%, lo que te da un 
+margen real de {real_margin}% sobre la inflación.
+""",
+    },
+    "en": {
+        "default_name": "Balanced",
+        "base": """I analyzed your request using the QAOA algorithm (Quantum Approximate Optimization Algorithm). 
+
+📊 **Detected profile**: {name}
+{description}
+
+💡 **Key metrics**:
+- Expected return: {expected_return}% per year
+- Volatility: {volatility}%
+- Sharpe ratio: {sharpe_ratio} (higher means a better return/risk trade-off)
+- VaR 95%: {var_95}% (maximum probable loss in 95% of cases)
+""",
+        "inflation": """
+🎯 **To beat Spanish inflation** (currently ~{inflation}%), this portfolio has 
+an expected return of {expected_return}%, which gives you a 
+real margin of {real_margin}% over inflation.
+""",
+        "profiles": {
+            "conservador_espanol": {
+                "name": "Conservative Spain",
+                "description": "For those who prioritize preserving capital. Ideal for a first €1,000-5,000",
+            },
+            "equilibrado_global": {
+                "name": "Balanced Global",
+                "description": "Risk-return balance. For 5-10 year investing",
+            },
+            "crecimiento_tech": {
+                "name": "Tech Growth",
+                "description": "Higher risk, higher potential. Only with capital you can afford to lose",
+            },
+            "agresivo_crypto": {
+                "name": "Aggressive with Crypto",
+                "description": "High volatility. At most 5-10% of your total wealth",
+            },
+        },
+    },
+}
+
+DEFAULT_LANGUAGE = "es"
+
+# Slots filled per request, in the positional order of compiled templates.
+_EXPLANATION_SLOTS = ("expected_return", "volatility", "sharpe_ratio", "var_95", "real_margin")
+
+# (language, profile_id, is_inflation) -> bound str.format of a template whose
+# profile slots are already filled in and metric slots are positional.
+_COMPILED_EXPLANATIONS: Dict[Tuple[str, Optional[str], bool], Callable[..., str]] = {}
+
+
+class _TemplateSlots(dict):
+    """format_map mapping that leaves unknown slots as literal text."""
+
+    def __missing__(self, key: str) -> str:
+        return "{{" + key + "}}"
+
+
+def _escape_format(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _compile_explanation(language: str, profile_id: Optional[str], is_inflation: bool) -> Callable[..., str]:
+    """
+    Fill the profile slots of a template once, leaving positional metric slots.
+
+    format_map substitutes every slot in a single pass, so profile text is
+    inserted (escaped) as-is and never re-read as a template.
+    """
+    templates = EXPLANATION_TEMPLATES[language]
+    profile = templates.get("profiles", {}).get(profile_id) or PORTFOLIO_PROFILES.get(profile_id, {})
+    template = templates["base"] + (templates["inflation"] if is_inflation else "")
+
+    slots = _TemplateSlots(
+        name=_escape_format(profile.get("name", templates["default_name"])),
+        description=_escape_format(profile.get("description", "")),
+        inflation=str(INFLATION_SPAIN),
+    )
+    for position, slot in enumerate(_EXPLANATION_SLOTS):
+        slots[slot] = "{" + str(position) + "}"
+    return template.format_map(slots).format
+
+
+def compile_explanation_templates() -> None:
+    """Precompute the profile-dependent part of every explanation template."""
+    for language in EXPLANATION_TEMPLATES:
+        for profile_id in [*PORTFOLIO_PROFILES, None]:
+            for is_inflation in (False, True):
+                key = (language, profile_id, is_inflation)
+                _COMPILED_EXPLANATIONS[key] = _compile_explanation(*key)
+
+
+def generate_explanation(
+    profile_name: str,
+    metrics: PortfolioMetrics,
+    is_inflation: bool = False,
+    language: str = DEFAULT_LANGUAGE,
+) -> str:
+    """Generate natural language explanation for the portfolio."""
     
-    if is_inflation:
-        base_explanation += f"""
-🎯 **Para batir la inflación española** (actualmente ~3.2%), esta cartera tiene 
-una rentabilidad esperada de {metrics.expected_return}%, lo que te da un 
-margen real de {round(metrics.expected_return - 3.2, 1)}% sobre la inflación.
-"""
+    render = _COMPILED_EXPLANATIONS.get((language, profile_name, is_inflation))
+    if render is None:
+        if language not in EXPLANATION_TEMPLATES:
+            language = DEFAULT_LANGUAGE
+        if profile_name not in PORTFOLIO_PROFILES:
+            profile_name = None
+        key = (language, profile_name, is_inflation)
+        render = _COMPILED_EXPLANATIONS.get(key)
+        if render is None:
+            render = _COMPILED_EXPLANATIONS[key] = _compile_explanation(*key)
     
-    return base_explanation
+    expected_return = metrics.expected_return
+    # real_margin only appears in the inflation paragraph.
+    real_margin = round(expected_return - INFLATION_SPAIN, 1) if is_inflation else None
+    return render(expected_return, metrics.volatility, metrics.sharpe_ratio, metrics.var_95, real_margin)
+
+
+# =============================================================================
+# STRESS TESTING
+# =============================================================================
+
+# ECB deposit rate (%) used as the starting point of rate scenarios.
+ECB_RATE = 4.5
+
+# Factor shocks are returns (0.10 = +10%) except ecb_rate, which is a change
+# in percentage points.
+STRESS_FACTORS = ["ibex", "global_equity", "us_tech", "crypto", "ecb_rate"]
+
+# Annualized factor volatilities used to draw random scenarios.
+STRESS_FACTOR_VOLS = {
+    "ibex": 0.18,
+    "global_equity": 0.15,
+    "us_tech": 0.25,
+    "crypto": 0.70,
+    "ecb_rate": 0.75,
+}
+
+# Simulated sensitivity of each asset's return to each factor.
+ASSET_FACTOR_EXPOSURES = {
+    "SAN.MC": {"ibex": 1.2, "ecb_rate": 0.03},
+    "BBVA.MC": {"ibex": 1.15, "ecb_rate": 0.03},
+    "ITX.MC": {"ibex": 0.9, "global_equity": 0.3, "ecb_rate": -0.02},
+    "IBE.MC": {"ibex": 0.6, "ecb_rate": -0.05},
+    "TEF.MC": {"ibex": 0.7, "ecb_rate": -0.03},
+    "REP.MC": {"ibex": 1.0, "ecb_rate": -0.01},
+    "AMS.MC": {"ibex": 0.9, "us_tech": 0.3, "ecb_rate": -0.03},
+    "FER.MC": {"ibex": 0.85, "ecb_rate": -0.04},
+    "VWCE.DE": {"global_equity": 1.0, "ecb_rate": -0.02},
+    "CSPX.L": {"global_equity": 1.0, "us_tech": 0.3, "ecb_rate": -0.02},
+    "EUNL.DE": {"global_equity": 1.0, "ecb_rate": -0.02},
+    "IBTS.L": {"ecb_rate": -0.018},  # ~1.8 years duration
+    "BTC-EUR": {"crypto": 1.0, "global_equity": 0.3},
+    "ETH-EUR": {"crypto": 1.3, "global_equity": 0.3},
+    "AAPL": {"global_equity": 0.8, "us_tech": 1.0},
+    "MSFT": {"global_equity": 0.8, "us_tech": 0.9},
+    "GOOGL": {"global_equity": 0.8, "us_tech": 1.0},
+    "NVDA": {"global_equity": 0.9, "us_tech": 1.6},
+    "TSLA": {"global_equity": 0.9, "us_tech": 1.4},
+}
+
+STRESS_SCENARIOS = {
+    "ecb_rate_hike": {
+        "name": "Subida de tipos del BCE",
+        "description": f"El BCE sube tipos 1 punto (del {ECB_RATE}% al {ECB_RATE + 1}%)",
+        "shocks": {"ecb_rate": 1.0, "ibex": -0.04, "global_equity": -0.03, "us_tech": -0.05},
+    },
+    "ecb_rate_cut": {
+        "name": "Bajada de tipos del BCE",
+        "description": f"El BCE baja tipos 0,5 puntos (del {ECB_RATE}% al {ECB_RATE - 0.5}%)",
+        "shocks": {"ecb_rate": -0.5, "ibex": 0.02, "global_equity": 0.02, "us_tech": 0.03},
+    },
+    "crypto_crash": {
+        "name": "Crash cripto",
+        "description": "Las criptomonedas caen un 60%",
+        "shocks": {"crypto": -0.60, "us_tech": -0.05},
+    },
+    "ibex_drawdown": {
+        "name": "Caída del IBEX 35",
+        "description": "El IBEX 35 cae un 20%",
+        "shocks": {"ibex": -0.20, "global_equity": -0.05},
+    },
+    "tech_selloff": {
+        "name": "Corrección tecnológica",
+        "description": "Las tecnológicas de EE.UU. caen un 30%",
+        "shocks": {"us_tech": -0.30, "global_equity": -0.08, "crypto": -0.15},
+    },
+    "global_recession": {
+        "name": "Recesión global",
+        "description": "Caída generalizada de bolsas y bajada de tipos de emergencia",
+        "shocks": {"ibex": -0.25, "global_equity": -0.25, "us_tech": -0.20, "crypto": -0.50, "ecb_rate": -1.0},
+    },
+}
+
+# Largest portfolios x scenarios P&L matrix one request may build (80 MB of float64).
+STRESS_MAX_CELLS = 10_000_000
+
+_stress_model: Optional[Dict[str, Any]] = None
+
+
+def get_stress_model() -> Dict[str, Any]:
+    """
+    Build the factor exposure and scenario-by-asset shock matrices once.
+
+    NumPy is imported here, on first use, to keep worker startup fast.
+    """
+    global _stress_model
+    if _stress_model is None:
+        import numpy as np
+
+        tickers = get_risk_model()["tickers"]
+        exposures = np.array([
+            [ASSET_FACTOR_EXPOSURES.get(ticker, {}).get(factor, 0.0) for ticker in tickers]
+            for factor in STRESS_FACTORS
+        ])
+        scenario_ids = list(STRESS_SCENARIOS.keys())
+        factor_shocks = np.array([
+            [STRESS_SCENARIOS[sid]["shocks"].get(factor, 0.0) for factor in STRESS_FACTORS]
+            for sid in scenario_ids
+        ])
+        _stress_model = {
+            "tickers": tickers,
+            "ticker_index": {ticker: i for i, ticker in enumerate(tickers)},
+            "exposures": exposures,  # factors x assets
+            "factor_vols": np.array([STRESS_FACTOR_VOLS[f] for f in STRESS_FACTORS]),
+            "scenario_ids": scenario_ids,
+            "scenario_index": {sid: i for i, sid in enumerate(scenario_ids)},
+            "shocks": factor_shocks @ exposures,  # scenarios x assets
+        }
+    return _stress_model
+
+
+def build_stress_weights(portfolios: List[StressPortfolio]):
+    """Turn portfolios into a portfolios x assets matrix of weight fractions."""
+    import numpy as np
+
+    model = get_stress_model()
+    ticker_index = model["ticker_index"]
+    weights = np.zeros((len(portfolios), len(model["tickers"])))
+
+    for row, portfolio in enumerate(portfolios):
+        if portfolio.weights:
+            allocation = portfolio.weights
+        elif portfolio.profile is not None:
+            profile = PORTFOLIO_PROFILES[portfolio.profile.value]
+            allocation = dict(zip(profile["tickers"], profile["weights"]))
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cartera {row}: indica un perfil o los pesos de los activos",
+            )
+
+        invalid_tickers = [t for t in allocation if t not in ticker_index]
+        if invalid_tickers:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cartera {row}: tickers no válidos: {invalid_tickers}",
+            )
+        for ticker, weight in allocation.items():
+            weights[row, ticker_index[ticker]] = weight
+
+    totals = weights.sum(axis=1, keepdims=True)
+    if (totals <= 0).any():
+        raise HTTPException(status_code=400, detail="Los pesos de cada cartera deben sumar más de 0")
+    return weights / totals
+
+
+def _pnl_summary(pnl, axis: int) -> Dict[str, List[float]]:
+    """Mean, min/max and 5/50/95 percentiles of P&L along axis."""
+    import numpy as np
+
+    # Same values as np.percentile's default (linear) method, read off one
+    # sort. np.percentile and multi-kth np.partition select each rank in
+    # turn and take ~5x longer on a 1,000 x 1,000 matrix.
+    ordered = np.sort(pnl, axis=axis)
+    last = pnl.shape[axis] - 1
+    positions = np.array([5, 50, 95]) / 100 * last
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, last)
+    low = np.take(ordered, lower, axis=axis)
+    high = np.take(ordered, upper, axis=axis)
+    fraction = (positions - lower).reshape([-1 if i == axis else 1 for i in range(pnl.ndim)])
+    p5, p50, p95 = np.moveaxis(low + (high - low) * fraction, axis, 0)
+
+    return {
+        "mean": np.round(pnl.mean(axis=axis), 2).tolist(),
+        "min": np.round(np.take(ordered, 0, axis=axis), 2).tolist(),
+        "p5": np.round(p5, 2).tolist(),
+        "median": np.round(p50, 2).tolist(),
+        "p95": np.round(p95, 2).tolist(),
+        "max": np.round(np.take(ordered, last, axis=axis), 2).tolist(),
+    }
+
+
+def run_stress_test(request: StressRequest) -> Dict[str, Any]:
+    """
+    Apply shock scenarios to every portfolio with one matrix product.
+
+    P&L (EUR) = capital * weights (portfolios x assets) @ shocks.T (assets x scenarios).
+    """
+    import numpy as np
+
+    started = time.perf_counter()
+    model = get_stress_model()
+
+    scenario_ids = request.scenarios if request.scenarios is not None else model["scenario_ids"]
+    unknown = [sid for sid in scenario_ids if sid not in model["scenario_index"]]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Escenarios no válidos: {unknown}")
+
+    cells = len(request.portfolios) * max(len(scenario_ids), request.simulations)
+    if cells > STRESS_MAX_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Demasiados cálculos: carteras x escenarios no puede superar {STRESS_MAX_CELLS:,}",
+        )
+
+    weights = build_stress_weights(request.portfolios)
+    shocks = model["shocks"][[model["scenario_index"][sid] for sid in scenario_ids]]
+    pnl = request.capital * (weights @ shocks.T)  # portfolios x scenarios
+
+    # Per-scenario summaries across portfolios, computed in one pass.
+    summary = _pnl_summary(pnl, axis=0) if scenario_ids else {}
+    scenarios = [
+        {
+            "id": sid,
+            "name": STRESS_SCENARIOS[sid]["name"],
+            "description": STRESS_SCENARIOS[sid]["description"],
+            "pnl": np.round(pnl[:, i], 2).tolist(),
+            "distribution": {stat: values[i] for stat, values in summary.items()},
+        }
+        for i, sid in enumerate(scenario_ids)
+    ]
+
+    simulated = None
+    if request.simulations:
+        rng = np.random.default_rng(request.seed)
+        factor_shocks = rng.standard_normal((request.simulations, len(STRESS_FACTORS))) * model["factor_vols"]
+        sim_pnl = request.capital * (weights @ (factor_shocks @ model["exposures"]).T)
+        simulated = {
+            "count": request.simulations,
+            # Distribution across simulated scenarios for each portfolio
+            "per_portfolio": _pnl_summary(sim_pnl, axis=1),
+            # Distribution across portfolios for each simulated scenario
+            "per_scenario": _pnl_summary(sim_pnl, axis=0) if request.per_scenario_summary else None,
+        }
+
+    return {
+        "success": True,
+        "capital": request.capital,
+        "n_portfolios": len(request.portfolios),
+        "scenarios": scenarios,
+        "simulated": simulated,
+        "compute_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+# =============================================================================
+# SHARED SOLVER CACHE
+# =============================================================================
+
+# Solver results are shared by every worker through the cache backend
+# (SQLite by default, Redis when QUANTUMCOACH_CACHE_URL points to one).
+SOLVER_CACHE_TTL = float(os.environ.get("QUANTUMCOACH_CACHE_TTL", DEFAULT_TTL_SECONDS))
+
+_solver_cache: Optional[CacheBackend] = None
+
+
+def get_solver_cache() -> CacheBackend:
+    """Return the process-wide cache backend, creating it on first use."""
+    global _solver_cache
+    if _solver_cache is None:
+        _solver_cache = create_cache()
+    return _solver_cache
+
+
+def normalize_risk_aversion(risk_aversion: float) -> float:
+    """Round risk aversion so near-identical requests share a cache entry and solver job."""
+    return round(float(risk_aversion), 4)
+
+
+def _solver_cache_key(tickers: List[str], risk_aversion: float, benchmark_active: bool) -> str:
+    return f"qaoa:v1:{','.join(tickers)}:{normalize_risk_aversion(risk_aversion):.4f}:{int(benchmark_active)}"
+
+
+def _encode_solver_result(result: Dict[str, Any], metrics: PortfolioMetrics) -> bytes:
+    """Pack weights, timings and metrics as float vectors."""
+    vectors = [
+        result["weights"],
+        [result["qaoa_time_ms"]],
+        [getattr(metrics, field) for field in PortfolioMetrics.model_fields],
+    ]
+    if "classical_weights" in result:
+        vectors.append(result["classical_weights"])
+        vectors.append([result["classical_time_ms"], result["quantum_advantage"]])
+    return encode_floats(*vectors)
+
+
+def _decode_solver_result(blob: bytes) -> Tuple[Dict[str, Any], PortfolioMetrics]:
+    vectors = decode_floats(blob)
+    result = {
+        "weights": vectors[0],
+        "qaoa_time_ms": vectors[1][0],
+    }
+    metrics = PortfolioMetrics(**dict(zip(PortfolioMetrics.model_fields, vectors[2])))
+    if len(vectors) == 5:
+        result["classical_weights"] = vectors[3]
+        result["classical_time_ms"], result["quantum_advantage"] = vectors[4]
+    return result, metrics
+
+
+def solve_portfolio(
+    tickers: List[str],
+    risk_aversion: float,
+    benchmark_active: bool = False,
+    lock_ttl: float = DEFAULT_LOCK_TTL_SECONDS,
+) -> Tuple[Dict[str, Any], PortfolioMetrics]:
+    """
+    Run the QAOA optimization and metrics, reusing results shared by all workers.
+
+    Identical requests across workers are solved once (single-flight) and
+    served from the cache until SOLVER_CACHE_TTL expires. Solves slower than
+    lock_ttl lose the lock and may be repeated by another worker. This blocks
+    while waiting for the lock, so call it from a threadpool in async endpoints.
+    """
+    def compute() -> bytes:
+        result = simulate_qaoa_optimization(
+            tickers=tickers,
+            risk_aversion=risk_aversion,
+            benchmark_active=benchmark_active,
+        )
+        metrics = calculate_portfolio_metrics(tickers, result["weights"])
+        return _encode_solver_result(result, metrics)
+
+    key = _solver_cache_key(tickers, risk_aversion, benchmark_active)
+    blob = get_solver_cache().get_or_compute(key, compute, ttl=SOLVER_CACHE_TTL, lock_ttl=lock_ttl)
+    return _decode_solver_result(blob)
+
+
+# =============================================================================
+# SOLVER MICRO-BATCHING
+# =============================================================================
+
+# Concurrent solver jobs are collected for a short window (or until the batch
+# is full), identical jobs are merged, and the distinct ones are handed to the
+# solver as one batch. A vectorized solver can replace solve_portfolio_batch.
+SOLVER_BATCH_WINDOW_MS = float(os.environ.get("QUANTUMCOACH_BATCH_WINDOW_MS", 3))
+SOLVER_BATCH_MAX_SIZE = int(os.environ.get("QUANTUMCOACH_BATCH_MAX_SIZE", 32))
+SOLVER_EXECUTOR_WORKERS = int(os.environ.get("QUANTUMCOACH_SOLVER_WORKERS", 8))
+
+# (tickers, normalized risk_aversion, benchmark_active)
+SolverJob = Tuple[Tuple[str, ...], float, bool]
+SolverOutput = Tuple[Dict[str, Any], PortfolioMetrics]
+# Per job: its output, or the exception that job raised.
+SolverBatchResult = List[Union[SolverOutput, BaseException]]
+
+_solver_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_solver_executor() -> ThreadPoolExecutor:
+    """Return the process-wide solver executor, creating it on first use."""
+    global _solver_executor
+    if _solver_executor is None:
+        _solver_executor = ThreadPoolExecutor(
+            max_workers=SOLVER_EXECUTOR_WORKERS, thread_name_prefix="qaoa-solver"
+        )
+    return _solver_executor
+
+
+def shutdown_solver_executor() -> None:
+    """Wait for running solves and release the executor threads."""
+    global _solver_executor
+    if _solver_executor is not None:
+        _solver_executor.shutdown(wait=True)
+        _solver_executor = None
+
+
+def _solve_job(job: SolverJob) -> Union[SolverOutput, BaseException]:
+    tickers, risk_aversion, benchmark_active = job
+    try:
+        return solve_portfolio(list(tickers), risk_aversion, benchmark_active)
+    except Exception as exc:
+        return exc
+
+
+def solve_portfolio_batch(jobs: List[SolverJob]) -> SolverBatchResult:
+    """
+    Solve a batch of distinct jobs, returning a result or exception per job.
+
+    The simulated solver has no vectorized mode, so jobs run in parallel on
+    the solver executor and each one fails on its own.
+    """
+    if len(jobs) == 1:
+        return [_solve_job(jobs[0])]
+    return list(get_solver_executor().map(_solve_job, jobs))
+
+
+class SolverBatcher:
+    """
+    Asyncio dispatcher that coalesces solver jobs into micro-batches.
+
+    Waiters for the same job share one future, including jobs that are
+    already running, so each distinct job is solved once. solve_batch gets
+    the distinct jobs of a batch and returns a result or exception for each,
+    so one failing job only fails its own waiters.
+    """
+
+    def __init__(
+        self,
+        solve_batch: Callable[[List[SolverJob]], SolverBatchResult] = solve_portfolio_batch,
+        window_ms: float = SOLVER_BATCH_WINDOW_MS,
+        max_size: int = SOLVER_BATCH_MAX_SIZE,
+    ):
+        self.solve_batch = solve_batch
+        self.window_ms = window_ms
+        self.max_size = max(1, max_size)
+        self._pending: Dict[SolverJob, Tuple[asyncio.Future, float]] = {}
+        self._inflight: Dict[SolverJob, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self._stats = {
+            "jobs_submitted": 0,
+            "jobs_merged": 0,
+            "jobs_dispatched": 0,
+            "jobs_failed": 0,
+            "batches": 0,
+            "batch_size_max": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+        }
+
+    async def submit(
+        self,
+        tickers: List[str],
+        risk_aversion: float,
+        benchmark_active: bool = False
+    ) -> SolverOutput:
+        """Queue a job and wait for its result."""
+        job = (tuple(tickers), normalize_risk_aversion(risk_aversion), benchmark_active)
+        self._stats["jobs_submitted"] += 1
+
+        future = self._inflight.get(job)
+        if future is None and job in self._pending:
+            future = self._pending[job][0]
+        if future is not None:
+            self._stats["jobs_merged"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[job] = (future, time.perf_counter())
+            if len(self._pending) >= self.max_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+
+        # Shield so one cancelled request does not cancel the shared job.
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        now = time.perf_counter()
+        for job, (future, queued_at) in batch.items():
+            wait_ms = (now - queued_at) * 1000
+            self._stats["queue_wait_ms_total"] += wait_ms
+            self._stats["queue_wait_ms_max"] = max(self._stats["queue_wait_ms_max"], wait_ms)
+            self._inflight[job] = future
+
+        self._stats["batches"] += 1
+        self._stats["jobs_dispatched"] += len(batch)
+        self._stats["batch_size_max"] = max(self._stats["batch_size_max"], len(batch))
+
+        # Keep a reference so the task is not garbage-collected mid-batch.
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: Dict[SolverJob, Tuple[asyncio.Future, float]]) -> None:
+        jobs = list(batch)
+        try:
+            results = await run_in_threadpool(self.solve_batch, jobs)
+            if len(results) != len(jobs):
+                raise RuntimeError(f"solve_batch returned {len(results)} results for {len(jobs)} jobs")
+        except Exception as exc:
+            # The batch call itself broke, so no job has a result.
+            results = [exc] * len(jobs)
+
+        for job, result in zip(jobs, results):
+            self._inflight.pop(job, None)
+            future = batch[job][0]
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                self._stats["jobs_failed"] += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Dispatch anything still queued and wait for running batches."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait metrics since startup."""
+        stats = self._stats
+        batches = stats["batches"]
+        dispatched = stats["jobs_dispatched"]
+        return {
+            "window_ms": self.window_ms,
+            "max_batch_size": self.max_size,
+            "jobs_submitted": stats["jobs_submitted"],
+            "jobs_merged": stats["jobs_merged"],
+            "jobs_dispatched": dispatched,
+            "jobs_failed": stats["jobs_failed"],
+            "batches": batches,
+            "batch_size_mean": round(dispatched / batches, 2) if batches else 0.0,
+            "batch_size_max": stats["batch_size_max"],
+            "queue_wait_ms_mean": round(stats["queue_wait_ms_total"] / dispatched, 3) if dispatched else 0.0,
+            "queue_wait_ms_max": round(stats["queue_wait_ms_max"], 3),
+            "queued": len(self._pending),
+            "inflight": len(self._inflight),
+        }
+
+
+_solver_batcher: Optional[SolverBatcher] = None
+
+
+def get_solver_batcher() -> SolverBatcher:
+    """Return the process-wide solver batcher, creating it on first use."""
+    global _solver_batcher
+    if _solver_batcher is None:
+        _solver_batcher = SolverBatcher()
+    return _solver_batcher
+
+
+# =============================================================================
+# RISK MODEL SNAPSHOT
+# =============================================================================
+
+# Precomputed asset universe and profile metrics, loaded once per worker at
+# startup. Rebuild it with `python app.py --build-snapshot` after editing the
+# asset database or the portfolio profiles.
+RISK_MODEL_SNAPSHOT_PATH = os.environ.get(
+    "QUANTUMCOACH_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "risk_model_snapshot.json"),
+)
+
+RISK_MODEL: Optional[Dict[str, Any]] = None
+
+
+def _risk_model_fingerprint() -> str:
+    """Hash of the inputs of the risk model, used to detect stale snapshots."""
+    source = json.dumps({"assets": ALL_ASSETS, "profiles": PORTFOLIO_PROFILES}, sort_keys=True)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def build_risk_model() -> Dict[str, Any]:
+    """Compute the asset universe and nominal profile metrics from scratch."""
+    tickers = list(ALL_ASSETS.keys())
+    return {
+        "fingerprint": _risk_model_fingerprint(),
+        "universe": {
+            "ibex35": list(IBEX35_ASSETS.keys()),
+            "etfs": list(ETF_ASSETS.keys()),
+            "crypto": list(CRYPTO_ASSETS.keys()),
+            "us_tech": list(US_TECH_ASSETS.keys()),
+        },
+        "tickers": tickers,
+        "profile_metrics": {
+            profile_id: calculate_portfolio_metrics(profile["tickers"], profile["weights"]).model_dump()
+            for profile_id, profile in PORTFOLIO_PROFILES.items()
+        },
+    }
+
+
+def write_risk_model_snapshot(path: Optional[str] = None) -> Dict[str, Any]:
+    """Build the risk model and write it to the snapshot file."""
+    path = path or RISK_MODEL_SNAPSHOT_PATH
+    model = build_risk_model()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return model
+
+
+def load_risk_model(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the risk model from the snapshot file.
+
+    Falls back to computing it in-process when the snapshot is missing or was
+    built from a different asset database.
+    """
+    global RISK_MODEL
+    path = path or RISK_MODEL_SNAPSHOT_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            model = json.load(f)
+    except (OSError, ValueError):
+        model = None
+
+    if model is None or model.get("fingerprint") != _risk_model_fingerprint():
+        logger.warning("Risk model snapshot missing or stale at %s, rebuilding in memory", path)
+        model = build_risk_model()
+        STARTUP_REPORT["snapshot_source"] = "computed"
+    else:
+        STARTUP_REPORT["snapshot_source"] = "file"
+
+    RISK_MODEL = model
+    return model
+
+
+def get_risk_model() -> Dict[str, Any]:
+    """Return the loaded risk model, loading it if the lifespan hook has not run."""
+    return RISK_MODEL if RISK_MODEL is not None else load_risk_model()
+
+
+# =============================================================================
+# STARTUP & READINESS
+# =============================================================================
+
+# Time budget for import plus synchronous startup work; anything slower is
+# moved to the background warm-up.
+STARTUP_BUDGET_MS = float(os.environ.get("QUANTUMCOACH_STARTUP_BUDGET_MS", 500))
+
+STARTUP_REPORT: Dict[str, Any] = {
+    "import_ms": 0.0,
+    "snapshot_ms": None,
+    "snapshot_source": None,
+    "templates_ms": None,
+    "startup_ms": None,
+    "budget_ms": STARTUP_BUDGET_MS,
+    "within_budget": None,
+    "warmup": {},
+    "ready": False,
+    "error": None,
+}
+
+
+async def warm_up() -> None:
+    """Initialize the shared cache, pre-solve every profile and build the stress model."""
+    started = time.perf_counter()
+    try:
+        await run_in_threadpool(get_solver_cache)
+        STARTUP_REPORT["warmup"]["cache_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        solver_started = time.perf_counter()
+        batcher = get_solver_batcher()
+        await asyncio.gather(*(
+            batcher.submit(profile["tickers"], profile["risk_aversion"])
+            for profile in PORTFOLIO_PROFILES.values()
+        ))
+        STARTUP_REPORT["warmup"]["solver_ms"] = round((time.perf_counter() - solver_started) * 1000, 2)
+
+        stress_started = time.perf_counter()
+        await run_in_threadpool(get_stress_model)
+        STARTUP_REPORT["warmup"]["stress_ms"] = round((time.perf_counter() - stress_started) * 1000, 2)
+    except Exception as exc:
+        # Stay not-ready so /api/ready keeps failing the health check.
+        logger.exception("Background warm-up failed")
+        STARTUP_REPORT["error"] = f"{type(exc).__name__}: {exc}"
+        STARTUP_REPORT["warmup"]["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return
+
+    STARTUP_REPORT["warmup"]["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    STARTUP_REPORT["ready"] = True
+    logger.info("QuantumCoach ready: %s", STARTUP_REPORT)
 
 
 # =============================================================================
@@ -502,9 +1377,25 @@ async def root():
     }
 
 
+@app.get("/api/ready")
+async def readiness():
+    """Readiness check: 503 until background warm-up has finished, or if it failed."""
+    return JSONResponse(
+        status_code=200 if STARTUP_REPORT["ready"] else 503,
+        content={"ready": STARTUP_REPORT["ready"], "startup": STARTUP_REPORT},
+    )
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Solver batching metrics for this worker."""
+    return {"solver_batching": get_solver_batcher().metrics()}
+
+
 @app.get("/api/profiles")
 async def get_profiles():
     """Get available portfolio profiles."""
+    profile_metrics = get_risk_model()["profile_metrics"]
     return {
         "profiles": [
             {
@@ -512,6 +1403,7 @@ async def get_profiles():
                 "name": val["name"],
                 "description": val["description"],
                 "risk_aversion": val["risk_aversion"],
+                "metrics": profile_metrics.get(key),
             }
             for key, val in PORTFOLIO_PROFILES.items()
         ]
@@ -521,12 +1413,7 @@ async def get_profiles():
 @app.get("/api/assets")
 async def get_assets():
     """Get available assets grouped by category."""
-    return {
-        "ibex35": list(IBEX35_ASSETS.keys()),
-        "etfs": list(ETF_ASSETS.keys()),
-        "crypto": list(CRYPTO_ASSETS.keys()),
-        "us_tech": list(US_TECH_ASSETS.keys()),
-    }
+    return get_risk_model()["universe"]
 
 
 @app.post("/api/chat", response_model=ChatResponse)
@@ -602,11 +1489,11 @@ QAOA puede explorar este espacio de soluciones de forma más eficiente que méto
     profile = PORTFOLIO_PROFILES[profile_id]
     tickers = profile["tickers"]
     
-    # Run QAOA optimization
-    qaoa_result = simulate_qaoa_optimization(
-        tickers=tickers,
-        risk_aversion=profile["risk_aversion"],
-        benchmark_active=request.benchmark_active,
+    # Run QAOA optimization (coalesced, and shared across workers through the solver cache)
+    qaoa_result, metrics = await get_solver_batcher().submit(
+        tickers,
+        profile["risk_aversion"],
+        request.benchmark_active,
     )
     
     # Build asset allocations
@@ -623,9 +1510,6 @@ QAOA puede explorar este espacio de soluciones de forma más eficiente que méto
             isin=asset_data.get("isin"),
         ))
     
-    # Calculate metrics
-    metrics = calculate_portfolio_metrics(tickers, qaoa_result["weights"])
-    
     # Build benchmark if active
     benchmark = None
     if request.benchmark_active:
@@ -644,7 +1528,7 @@ QAOA puede explorar este espacio de soluciones de forma más eficiente que méto
     
     # Generate explanation
     is_inflation = intent.get("message_addon", False)
-    explanation = generate_explanation(profile_id, metrics, is_inflation)
+    explanation = generate_explanation(profile_id, metrics, is_inflation, request.language)
     
     portfolio_response = OptimizationResponse(
         success=True,
@@ -694,10 +1578,10 @@ async def optimize_portfolio(
             detail=f"Tickers no válidos: {invalid_tickers}"
         )
     
-    qaoa_result = simulate_qaoa_optimization(
-        tickers=tickers,
-        risk_aversion=risk_aversion,
-        benchmark_active=benchmark,
+    qaoa_result, metrics = await get_solver_batcher().submit(
+        tickers,
+        risk_aversion,
+        benchmark,
     )
     
     assets = []
@@ -711,8 +1595,6 @@ async def optimize_portfolio(
             "volatility": asset_data["volatility"],
         })
     
-    metrics = calculate_portfolio_metrics(tickers, qaoa_result["weights"])
-    
     return {
         "success": True,
         "assets": assets,
@@ -739,16 +1621,46 @@ async def get_market_status():
         "change_percent": change,
         "is_up": is_up,
         "status": "open" if 9 <= datetime.now().hour < 17 else "closed",
-        "inflation_spain": 3.2,  # IPC Spain approx
-        "ecb_rate": 4.5,  # ECB rate
+        "inflation_spain": INFLATION_SPAIN,  # IPC Spain approx
+        "ecb_rate": ECB_RATE,  # ECB rate
         "timestamp": datetime.now().isoformat(),
     }
 
 
+@app.get("/api/stress/scenarios")
+async def get_stress_scenarios():
+    """List the available stress scenarios."""
+    return {
+        "scenarios": [
+            {"id": key, "name": val["name"], "description": val["description"], "shocks": val["shocks"]}
+            for key, val in STRESS_SCENARIOS.items()
+        ]
+    }
+
+
+@app.post("/api/stress")
+async def stress_test(request: StressRequest):
+    """
+    Stress-test one or many portfolios against shock scenarios.
+
+    Returns the P&L of every portfolio under each scenario, its distribution
+    across portfolios and, optionally, random factor scenarios.
+    """
+    return await run_in_threadpool(run_stress_test, request)
+
+
+STARTUP_REPORT["import_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)
+
+
 # =============================================================================
 # RUN SERVER
 # =============================================================================
 
 if __name__ == "__main__":
+    if "--build-snapshot" in sys.argv:
+        write_risk_model_snapshot()
+        print(f"Risk model snapshot written to {RISK_MODEL_SNAPSHOT_PATH}")
+        sys.exit(0)
+
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
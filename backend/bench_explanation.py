@@ -0,0 +1,96 @@
+"""
+Microbenchmark: templated explanation rendering vs. the original f-string.
+
+Run from the backend directory:
+
+    python bench_explanation.py
+"""
+
+import timeit
+
+from app import (
+    PORTFOLIO_PROFILES,
+    PortfolioMetrics,
+    compile_explanation_templates,
+    generate_explanation,
+)
+
+
+# Original implementation, kept verbatim for comparison.
+def legacy_generate_explanation(profile_name: str, metrics: PortfolioMetrics, is_inflation: bool = False) -> str:
+    """Generate natural language explanation for the portfolio."""
+    
+    profile = PORTFOLIO_PROFILES.get(profile_name, {})
+    
+    base_explanation = f"""He analizado tu solicitud usando el algoritmo QAOA (Quantum Approximate Optimization Algorithm). 
+
+📊 **Perfil detectado**: {profile.get('name', 'Equilibrado')}
+{profile.get('description', '')}
+
+💡 **Métricas clave**:
+- Rentabilidad esperada: {metrics.expected_return}% anual
+- Volatilidad: {metrics.volatility}%
+- Ratio de Sharpe: {metrics.sharpe_ratio} (a mayor valor, mejor relación rentabilidad/riesgo)
+- VaR 95%: {metrics.var_95}% (pérdida máxima probable en 95% de casos)
+"""
+    
+    if is_inflation:
+        base_explanation += f"""
+🎯 **Para batir la inflación española** (actualmente ~3.2%), esta cartera tiene 
+una rentabilidad esperada de {metrics.expected_return}%, lo que te da un 
+margen real de {round(metrics.expected_return - 3.2, 1)}% sobre la inflación.
+"""
+    
+    return base_explanation
+
+
+def _bench(fn, cases, rounds: int, repeat: int = 5) -> float:
+    """Return best-of-repeat microseconds per call of fn over the cases."""
+    elapsed = min(timeit.repeat(
+        lambda: [fn(profile_id, metrics, is_inflation) for profile_id, metrics, is_inflation in cases],
+        number=rounds,
+        repeat=repeat,
+    ))
+    return elapsed / (rounds * len(cases)) * 1e6
+
+
+def main(rounds: int = 10) -> None:
+    compile_explanation_templates()
+    profiles = [*PORTFOLIO_PROFILES, "desconocido"]
+
+    # Distinct metrics for every call: nothing is reused between requests.
+    cases = [
+        (
+            profiles[i % len(profiles)],
+            PortfolioMetrics(
+                expected_return=round(2 + i * 0.01, 2),
+                volatility=round(5 + i * 0.003, 2),
+                sharpe_ratio=round(0.1 + i * 0.0001, 2),
+                var_95=round(-4 - i * 0.002, 2),
+                max_drawdown=30.0,
+            ),
+            False,
+        )
+        for i in range(5000)
+    ]
+
+    # Both implementations must render identical Spanish output.
+    for profile_id, metrics, _ in cases[:100]:
+        for is_inflation in (False, True):
+            assert generate_explanation(profile_id, metrics, is_inflation) == \
+                legacy_generate_explanation(profile_id, metrics, is_inflation)
+
+    for is_inflation in (False, True):
+        run = [(profile_id, metrics, is_inflation) for profile_id, metrics, _ in cases]
+        legacy = _bench(legacy_generate_explanation, run, rounds)
+        templated = _bench(generate_explanation, run, rounds)
+        print(
+            f"inflation={is_inflation!s:<5}  "
+            f"f-string: {legacy:.2f} µs/call  "
+            f"templated: {templated:.2f} µs/call  "
+            f"speedup: {legacy / templated:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+QuantumCoach Cache Backends
+
+Shared storage for solver results and precomputed data, so that every uvicorn
+worker serves the same warm state instead of keeping its own cold copy.
+
+Two backends are available:
+- SQLiteCache: local file in WAL mode, shared by all workers on the same host.
+- RedisCache: any Redis-protocol client (redis-py or a local stand-in).
+
+Select one with the QUANTUMCOACH_CACHE_URL environment variable, e.g.
+"sqlite:///tmp/quantumcoach_cache.db" or "redis://localhost:6379/0".
+"""
+
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "quantumcoach_cache.db")
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_LOCK_TTL_SECONDS = 10.0
+LOCK_POLL_SECONDS = 0.01
+# SQLiteCache deletes expired rows once every this many writes.
+SQLITE_PURGE_EVERY_WRITES = 100
+
+# Delete the lock only if it still holds our token, atomically on the server.
+_REDIS_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+# =============================================================================
+# BINARY ENCODING
+# =============================================================================
+
+_ENCODING_VERSION = 1
+_HEADER = struct.Struct("<BH")  # version, number of vectors
+_LENGTH = struct.Struct("<H")
+
+
+def encode_floats(*vectors: Sequence[float]) -> bytes:
+    """
+    Pack one or more float vectors into a compact binary blob.
+
+    Layout: version byte, vector count, then for each vector its length
+    followed by little-endian float64 values.
+    """
+    parts = [_HEADER.pack(_ENCODING_VERSION, len(vectors))]
+    for vector in vectors:
+        parts.append(_LENGTH.pack(len(vector)))
+        parts.append(struct.pack(f"<{len(vector)}d", *vector))
+    return b"".join(parts)
+
+
+def decode_floats(blob: bytes) -> List[List[float]]:
+    """Unpack a blob produced by encode_floats back into float vectors."""
+    version, count = _HEADER.unpack_from(blob, 0)
+    if version != _ENCODING_VERSION:
+        raise ValueError(f"Unsupported cache encoding version: {version}")
+
+    offset = _HEADER.size
+    vectors = []
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(blob, offset)
+        offset += _LENGTH.size
+        vectors.append(list(struct.unpack_from(f"<{length}d", blob, offset)))
+        offset += length * 8
+    return vectors
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class CacheBackend:
+    """Base class for byte-oriented cache backends with cross-process locks."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def try_acquire(self, name: str, token: str, ttl: float) -> bool:
+        """Take the named lock if it is free or expired. Never blocks."""
+        raise NotImplementedError
+
+    def release(self, name: str, token: str) -> None:
+        """Release the named lock if it is still held by token."""
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(
+        self,
+        name: str,
+        ttl: float = DEFAULT_LOCK_TTL_SECONDS,
+        timeout: Optional[float] = None,
+    ) -> Iterator[None]:
+        """
+        Hold a lock shared by every process that uses this backend.
+
+        The lock expires after ttl seconds so a crashed worker cannot block
+        the others forever.
+        """
+        token = uuid.uuid4().hex
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire(name, token, ttl):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Could not acquire cache lock '{name}'")
+            time.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self.release(name, token)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], bytes],
+        ttl: Optional[float] = DEFAULT_TTL_SECONDS,
+        lock_ttl: float = DEFAULT_LOCK_TTL_SECONDS,
+    ) -> bytes:
+        """
+        Return the cached value for key, computing it at most once.
+
+        Concurrent callers in any worker wait on the same lock, and all but
+        the first find the value already stored when they get it.
+
+        The lock is not extended while compute() runs: if it takes longer
+        than lock_ttl the lock expires and another worker may compute the
+        same value. Pick lock_ttl above the slowest expected compute.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self.lock(f"lock:{key}", ttl=lock_ttl):
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self.set(key, value, ttl)
+        return value
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCache(CacheBackend):
+    """Cache stored in a local SQLite database in WAL mode."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, purge_every: int = SQLITE_PURGE_EVERY_WRITES):
+        self.path = path
+        self.purge_every = max(1, purge_every)
+        self._local = threading.local()
+        # Every connection opened by any thread, so close() can reach them all.
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS locks ("
+                "name TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; SQLite handles the cross-process side.
+        # check_same_thread is off only so close() can run from another thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn not in self._connections:
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                self._connections.add(conn)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return bytes(value)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, sqlite3.Binary(value), expires_at),
+        )
+
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge_expired(now)
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Delete expired cache rows and return how many were removed."""
+        now = time.time() if now is None else now
+        cursor = self._connect().execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        return cursor.rowcount
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def try_acquire(self, name: str, token: str, ttl: float) -> bool:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM locks WHERE name = ? AND expires_at <= ?", (name, now)
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO locks (name, token, expires_at) VALUES (?, ?, ?)",
+                (name, token, now + ttl),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def release(self, name: str, token: str) -> None:
+        self._connect().execute(
+            "DELETE FROM locks WHERE name = ? AND token = ?", (name, token)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for conn in connections:
+            conn.close()
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in Redis or anything that speaks its protocol.
+
+    Only get, set (with px/nx), delete and optionally eval are used, so a
+    small local stand-in client is enough for tests.
+    """
+
+    def __init__(self, client: Any, prefix: str = "quantumcoach:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The 'redis' package is required for redis:// cache URLs"
+            ) from exc
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        px = int(ttl * 1000) if ttl is not None else None
+        self.client.set(self.prefix + key, value, px=px)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def try_acquire(self, name: str, token: str, ttl: float) -> bool:
+        return bool(self.client.set(
+            self.prefix + name, token.encode(), nx=True, px=int(ttl * 1000)
+        ))
+
+    def release(self, name: str, token: str) -> None:
+        key = self.prefix + name
+        if hasattr(self.client, "eval"):
+            self.client.eval(_REDIS_RELEASE_SCRIPT, 1, key, token.encode())
+            return
+        # Clients without scripting: non-atomic check-then-delete. If the lock
+        # expires and is taken by another worker between the two calls, this
+        # deletes that worker's lock.
+        if self.client.get(key) == token.encode():
+            self.client.delete(key)
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+def create_cache(url: Optional[str] = None) -> CacheBackend:
+    """Build a cache backend from a URL (defaults to QUANTUMCOACH_CACHE_URL)."""
+    url = url or os.environ.get("QUANTUMCOACH_CACHE_URL", "")
+
+    if not url:
+        return SQLiteCache(DEFAULT_CACHE_PATH)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache.from_url(url)
+    if url.startswith("sqlite://"):
+        return SQLiteCache(url[len("sqlite://"):] or DEFAULT_CACHE_PATH)
+
+    raise ValueError(f"Unsupported cache URL: {url}")
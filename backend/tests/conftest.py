@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the subset of redis-py used by RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _alive(self, key):
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def get(self, key):
+        return self._alive(key)
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and self._alive(key) is not None:
+            return None
+        expires_at = time.monotonic() + px / 1000 if px is not None else None
+        self.data[key] = (value, expires_at)
+        return True
+
+    def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
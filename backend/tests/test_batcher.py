@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import app
+from app import SolverBatcher
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _echo_batch(jobs):
+    return list(jobs)
+
+
+def test_failing_job_does_not_fail_other_jobs():
+    def solve_batch(jobs):
+        return [ValueError("bad") if job[1] < 0 else job[0] for job in jobs]
+
+    async def main():
+        batcher = SolverBatcher(solve_batch, window_ms=5)
+        return await asyncio.gather(
+            batcher.submit(["A"], 0.5),
+            batcher.submit(["A"], 0.5),
+            batcher.submit(["B"], -1.0),
+            return_exceptions=True,
+        ), batcher
+
+    (first, duplicate, failed), batcher = _run(main())
+    assert first == ("A",)
+    assert duplicate == ("A",)
+    assert isinstance(failed, ValueError)
+    assert batcher.metrics()["jobs_failed"] == 1
+
+
+def test_broken_solve_batch_fails_its_jobs():
+    def solve_batch(jobs):
+        return []
+
+    async def main():
+        batcher = SolverBatcher(solve_batch, window_ms=1)
+        return await asyncio.gather(batcher.submit(["A"], 0.5), return_exceptions=True)
+
+    (result,) = _run(main())
+    assert isinstance(result, RuntimeError)
+
+
+def test_distinct_jobs_are_dispatched_as_one_batch():
+    batches = []
+
+    def solve_batch(jobs):
+        batches.append(list(jobs))
+        return _echo_batch(jobs)
+
+    async def main():
+        batcher = SolverBatcher(solve_batch, window_ms=5)
+        await asyncio.gather(
+            batcher.submit(["A", "B"], 0.5),
+            batcher.submit(["A", "B"], 0.50000001),
+            batcher.submit(["A", "B"], 0.5),
+            batcher.submit(["A", "C"], 0.5),
+        )
+        return batcher.metrics()
+
+    metrics = _run(main())
+    assert batches == [[(("A", "B"), 0.5, False), (("A", "C"), 0.5, False)]]
+    assert metrics["jobs_submitted"] == 4
+    assert metrics["jobs_merged"] == 2
+    assert metrics["batches"] == 1
+
+
+def test_default_batch_solves_jobs_in_parallel_and_isolates_errors(monkeypatch):
+    def slow_solve(tickers, risk_aversion, benchmark_active):
+        time.sleep(0.2)
+        if tickers == ["bad"]:
+            raise ValueError("bad")
+        return tickers
+
+    monkeypatch.setattr(app, "solve_portfolio", slow_solve)
+    jobs = [(("bad",), 0.5, False)] + [((str(i),), 0.5, False) for i in range(3)]
+
+    started = time.perf_counter()
+    results = app.solve_portfolio_batch(jobs)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.6
+    assert isinstance(results[0], ValueError)
+    assert results[1:] == [["0"], ["1"], ["2"]]
+
+
+def test_max_size_flushes_early_and_close_waits_for_tasks():
+    async def main():
+        batcher = SolverBatcher(_echo_batch, window_ms=10_000, max_size=2)
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit(["A"], 0.1), batcher.submit(["B"], 0.1)),
+            timeout=5,
+        )
+        await batcher.close()
+        return results, batcher
+
+    results, batcher = _run(main())
+    assert [r[0] for r in results] == [("A",), ("B",)]
+    assert not batcher._tasks
+    assert batcher.metrics()["inflight"] == 0
@@ -0,0 +1,182 @@
+import multiprocessing
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from cache import RedisCache, SQLiteCache, create_cache, decode_floats, encode_floats
+
+
+def test_encode_decode_round_trip():
+    vectors = [[33.3, 16.7, 50.0], [123.456], [], [-1e-9, 1e300]]
+    blob = encode_floats(*vectors)
+    assert decode_floats(blob) == vectors
+    # Header (3 bytes) + 4 lengths (2 bytes each) + 6 float64 values
+    assert len(blob) == 3 + 4 * 2 + 6 * 8
+
+
+def test_decode_rejects_unknown_version():
+    blob = bytearray(encode_floats([1.0]))
+    blob[0] = 99
+    with pytest.raises(ValueError):
+        decode_floats(bytes(blob))
+
+
+def test_create_cache_from_url(tmp_path):
+    cache = create_cache(f"sqlite://{tmp_path / 'c.db'}")
+    assert isinstance(cache, SQLiteCache)
+    with pytest.raises(ValueError):
+        create_cache("memcached://localhost")
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def redis_cache(fake_redis):
+    return RedisCache(fake_redis)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request):
+    return request.getfixturevalue(f"{request.param}_cache")
+
+
+def test_get_set_delete_and_expiry(backend):
+    assert backend.get("k") is None
+    backend.set("k", b"v")
+    assert backend.get("k") == b"v"
+    backend.delete("k")
+    assert backend.get("k") is None
+
+    backend.set("short", b"v", ttl=0.05)
+    time.sleep(0.1)
+    assert backend.get("short") is None
+
+
+def test_lock_token_semantics(backend):
+    assert backend.try_acquire("lock", "a", ttl=10)
+    assert not backend.try_acquire("lock", "b", ttl=10)
+
+    # Releasing with the wrong token leaves the lock in place.
+    backend.release("lock", "b")
+    assert not backend.try_acquire("lock", "b", ttl=10)
+
+    backend.release("lock", "a")
+    assert backend.try_acquire("lock", "b", ttl=10)
+
+
+def test_lock_expiry(backend):
+    assert backend.try_acquire("lock", "a", ttl=0.05)
+    time.sleep(0.1)
+    assert backend.try_acquire("lock", "b", ttl=10)
+    # The expired holder must not release the new holder's lock.
+    backend.release("lock", "a")
+    assert not backend.try_acquire("lock", "c", ttl=10)
+
+
+def test_get_or_compute_computes_once(backend):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b"result"
+
+    assert backend.get_or_compute("key", compute) == b"result"
+    assert backend.get_or_compute("key", compute) == b"result"
+    assert len(calls) == 1
+
+
+def test_redis_release_uses_eval_when_available(fake_redis):
+    scripts = []
+
+    def fake_eval(script, numkeys, key, token):
+        scripts.append(script)
+        if fake_redis.get(key) == token:
+            return fake_redis.delete(key)
+        return 0
+
+    fake_redis.eval = fake_eval
+    cache = RedisCache(fake_redis)
+    assert cache.try_acquire("lock", "a", ttl=10)
+    cache.release("lock", "b")
+    assert not cache.try_acquire("lock", "b", ttl=10)
+    cache.release("lock", "a")
+    assert cache.try_acquire("lock", "b", ttl=10)
+    assert len(scripts) == 2
+
+
+def _compute_in_worker(path, counter_path, barrier):
+    cache = SQLiteCache(path)
+
+    def compute():
+        with open(counter_path, "a") as f:
+            f.write("x")
+        time.sleep(0.2)
+        return b"shared"
+
+    barrier.wait()
+    assert cache.get_or_compute("solve", compute) == b"shared"
+    cache.close()
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_get_or_compute_single_flight_across_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    counter_path = str(tmp_path / "computed")
+    SQLiteCache(path).close()  # create the schema before the race
+
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(2)
+    workers = [
+        ctx.Process(target=_compute_in_worker, args=(path, counter_path, barrier))
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    with open(counter_path) as f:
+        assert f.read() == "x"
+
+
+def test_sqlite_purges_expired_rows(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), purge_every=3)
+    cache.set("old-1", b"v", ttl=0.01)
+    cache.set("old-2", b"v", ttl=0.01)
+    time.sleep(0.05)
+    cache.set("fresh", b"v", ttl=60)  # third write triggers the purge
+
+    rows = cache._connect().execute("SELECT key FROM cache").fetchall()
+    assert rows == [("fresh",)]
+    cache.close()
+
+
+def test_sqlite_close_closes_connections_from_all_threads(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    opened = []
+
+    def use_cache():
+        cache.set("k", b"v")
+        opened.append(cache._local.conn)
+
+    worker = threading.Thread(target=use_cache)
+    worker.start()
+    worker.join()
+
+    cache.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+    # The cache reconnects transparently after close().
+    assert cache.get("k") == b"v"
+    cache.close()
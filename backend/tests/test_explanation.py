@@ -0,0 +1,42 @@
+import app
+from app import PortfolioMetrics, generate_explanation
+
+
+METRICS = PortfolioMetrics(
+    expected_return=7.85,
+    volatility=12.4,
+    sharpe_ratio=0.39,
+    var_95=-12.55,
+    max_drawdown=31.0,
+)
+
+
+def test_spanish_explanation_fills_profile_and_metrics():
+    text = generate_explanation("conservador_espanol", METRICS, is_inflation=True)
+    assert "**Perfil detectado**: Conservador España" in text
+    assert "- Rentabilidad esperada: 7.85% anual" in text
+    assert "margen real de 4.6% sobre la inflación" in text
+
+
+def test_english_explanation_uses_translated_profile():
+    text = generate_explanation("conservador_espanol", METRICS, language="en")
+    assert "**Detected profile**: Conservative Spain" in text
+    assert "Conservador España" not in text
+    assert "Expected return: 7.85% per year" in text
+
+
+def test_unknown_language_and_profile_fall_back():
+    text = generate_explanation("desconocido", METRICS, language="fr")
+    assert text.startswith("He analizado tu solicitud")
+    assert "**Perfil detectado**: Equilibrado" in text
+
+
+def test_profile_text_is_not_substituted(monkeypatch):
+    profiles = dict(app.PORTFOLIO_PROFILES)
+    profiles["raro"] = {"name": "Raro {name}", "description": "Texto con {expected_return} y {0}"}
+    monkeypatch.setattr(app, "PORTFOLIO_PROFILES", profiles)
+    monkeypatch.setattr(app, "_COMPILED_EXPLANATIONS", {})
+
+    text = generate_explanation("raro", METRICS)
+    assert "**Perfil detectado**: Raro {name}" in text
+    assert "Texto con {expected_return} y {0}" in text
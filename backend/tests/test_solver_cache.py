@@ -0,0 +1,43 @@
+import pytest
+
+import app
+from cache import SQLiteCache
+
+
+@pytest.mark.parametrize("benchmark_active", [False, True])
+def test_solver_result_round_trip(benchmark_active):
+    tickers = ["SAN.MC", "AAPL", "BTC-EUR"]
+    result = app.simulate_qaoa_optimization(tickers, 0.5, benchmark_active)
+    metrics = app.calculate_portfolio_metrics(tickers, result["weights"])
+
+    decoded, decoded_metrics = app._decode_solver_result(app._encode_solver_result(result, metrics))
+
+    assert decoded == result
+    assert decoded_metrics == metrics
+    assert ("classical_weights" in decoded) is benchmark_active
+
+
+@pytest.fixture
+def solver_cache(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "solver.db"))
+    monkeypatch.setattr(app, "_solver_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_solve_portfolio_second_call_is_cache_hit(solver_cache, monkeypatch):
+    calls = []
+    simulate = app.simulate_qaoa_optimization
+
+    def counting_simulate(**kwargs):
+        calls.append(kwargs)
+        return simulate(**kwargs)
+
+    monkeypatch.setattr(app, "simulate_qaoa_optimization", counting_simulate)
+
+    first = app.solve_portfolio(["IBE.MC", "TEF.MC"], 0.8, True)
+    second = app.solve_portfolio(["IBE.MC", "TEF.MC"], 0.80001, True)
+
+    assert len(calls) == 1
+    assert first == second
+    assert solver_cache.get(app._solver_cache_key(["IBE.MC", "TEF.MC"], 0.8, True)) is not None
@@ -0,0 +1,92 @@
+import copy
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from cache import SQLiteCache
+
+
+@pytest.fixture
+def fresh_app(tmp_path, monkeypatch):
+    """Isolate module-level startup state and point caches at tmp files."""
+    monkeypatch.setattr(app, "STARTUP_REPORT", copy.deepcopy(app.STARTUP_REPORT))
+    monkeypatch.setattr(app, "RISK_MODEL", None)
+    monkeypatch.setattr(app, "_solver_cache", None)
+    monkeypatch.setattr(app, "_solver_batcher", None)
+    monkeypatch.setattr(app, "RISK_MODEL_SNAPSHOT_PATH", str(tmp_path / "snapshot.json"))
+    monkeypatch.setattr(app, "create_cache", lambda: SQLiteCache(str(tmp_path / "cache.db")))
+    return tmp_path
+
+
+def _wait_for_ready(client, expected_status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/api/ready")
+        if response.status_code == expected_status and response.json()["startup"]["warmup"].get("total_ms"):
+            return response
+        assert time.monotonic() < deadline, response.json()
+        time.sleep(0.02)
+
+
+def test_ready_is_503_until_warm_up_finishes(fresh_app, monkeypatch):
+    release = threading.Event()
+    get_solver_cache = app.get_solver_cache
+
+    def slow_cache():
+        release.wait(timeout=5)
+        return get_solver_cache()
+
+    monkeypatch.setattr(app, "get_solver_cache", slow_cache)
+
+    with TestClient(app.app) as client:
+        assert client.get("/").status_code == 200
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+        release.set()
+        response = _wait_for_ready(client, 200)
+        startup = response.json()["startup"]
+        assert startup["ready"] is True
+        assert startup["error"] is None
+        assert startup["snapshot_ms"] is not None
+
+
+def test_ready_stays_503_after_warm_up_error(fresh_app, monkeypatch):
+    def broken_stress_model():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(app, "get_stress_model", broken_stress_model)
+
+    with TestClient(app.app) as client:
+        response = _wait_for_ready(client, 503)
+        startup = response.json()["startup"]
+        assert startup["ready"] is False
+        assert startup["error"] == "RuntimeError: boom"
+
+
+def test_load_risk_model_falls_back_when_snapshot_missing(fresh_app):
+    model = app.load_risk_model()
+    assert app.STARTUP_REPORT["snapshot_source"] == "computed"
+    assert model == app.build_risk_model()
+
+
+def test_load_risk_model_falls_back_when_snapshot_stale(fresh_app):
+    stale = app.build_risk_model()
+    stale["fingerprint"] = "outdated"
+    stale["profile_metrics"] = {}
+    (fresh_app / "snapshot.json").write_text(json.dumps(stale))
+
+    model = app.load_risk_model()
+    assert app.STARTUP_REPORT["snapshot_source"] == "computed"
+    assert model["profile_metrics"]
+
+
+def test_load_risk_model_reads_snapshot_file(fresh_app):
+    written = app.write_risk_model_snapshot()
+    assert app.load_risk_model() == written
+    assert app.STARTUP_REPORT["snapshot_source"] == "file"
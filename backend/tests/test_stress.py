@@ -0,0 +1,116 @@
+import json
+import time
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import ALL_ASSETS, STRESS_MAX_CELLS, StressRequest, _pnl_summary, app, run_stress_test
+
+
+def test_single_asset_pnl_matches_exposure():
+    request = StressRequest(
+        portfolios=[{"weights": {"IBTS.L": 100}}, {"weights": {"BTC-EUR": 50, "ETH-EUR": 50}}],
+        scenarios=["ecb_rate_hike", "crypto_crash"],
+        capital=1000,
+    )
+    result = run_stress_test(request)
+    hike, crash = result["scenarios"]
+
+    # Bonds: -0.018 per rate point; crypto only via its 0.3 global-equity beta.
+    assert hike["pnl"] == [-18.0, -9.0]
+    # 0.5 * 1.0 * -60% + 0.5 * 1.3 * -60% of 1000 EUR
+    assert crash["pnl"] == [0.0, -690.0]
+    assert crash["distribution"]["min"] == -690.0
+    assert crash["distribution"]["max"] == 0.0
+
+
+def test_profiles_default_to_all_scenarios():
+    result = run_stress_test(StressRequest(portfolios=[{"profile": "agresivo_crypto"}]))
+    assert len(result["scenarios"]) >= 6
+    assert result["simulated"] is None
+
+
+def test_simulated_scenarios_report_both_distributions():
+    request = StressRequest(
+        portfolios=[{"profile": "conservador_espanol"}, {"profile": "agresivo_crypto"}],
+        scenarios=[],
+        simulations=300,
+        seed=7,
+        per_scenario_summary=True,
+    )
+    simulated = run_stress_test(request)["simulated"]
+
+    assert len(simulated["per_scenario"]["median"]) == 300
+    assert len(simulated["per_portfolio"]["p5"]) == 2
+    # The crypto portfolio has the fatter loss tail.
+    assert simulated["per_portfolio"]["p5"][1] < simulated["per_portfolio"]["p5"][0]
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (2, 7), (9, 4), (200, 150)])
+@pytest.mark.parametrize("axis", [0, 1])
+def test_pnl_summary_matches_numpy_percentile(shape, axis):
+    pnl = np.random.default_rng(3).normal(size=shape) * 100
+    summary = _pnl_summary(pnl, axis=axis)
+    p5, p50, p95 = np.round(np.percentile(pnl, [5, 50, 95], axis=axis), 2)
+
+    assert summary["p5"] == p5.tolist()
+    assert summary["median"] == p50.tolist()
+    assert summary["p95"] == p95.tolist()
+    assert summary["min"] == np.round(pnl.min(axis=axis), 2).tolist()
+    assert summary["max"] == np.round(pnl.max(axis=axis), 2).tolist()
+
+
+def test_thousand_by_thousand_stays_fast():
+    rng = np.random.default_rng(0)
+    tickers = list(ALL_ASSETS)
+    portfolios = [
+        {"weights": {tickers[i]: float(rng.uniform(1, 10)) for i in rng.choice(len(tickers), 6, replace=False)}}
+        for _ in range(1000)
+    ]
+    request = StressRequest(portfolios=portfolios, scenarios=[], simulations=1000, seed=0)
+
+    run_stress_test(request)  # warm the factor model
+    start = time.perf_counter()
+    result = run_stress_test(request)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    simulated = result["simulated"]
+    assert len(simulated["per_portfolio"]["median"]) == 1000
+    assert simulated["per_scenario"] is None
+    # ~15 ms here; the percentile-based summaries took ~80 ms.
+    assert result["compute_ms"] < 50
+    assert elapsed_ms < 200
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"portfolios": [{"weights": {"XX": 1}}]},
+        {"portfolios": [{}]},
+        {"portfolios": [{"weights": {"AAPL": 0}}]},
+        {"portfolios": [{"profile": "agresivo_crypto"}], "scenarios": ["nope"]},
+        # Short positions would lever the portfolio beyond its capital.
+        {"portfolios": [{"weights": {"IBE.MC": 1, "BTC-EUR": -0.99}}]},
+        {"portfolios": [{"weights": {"IBE.MC": float("inf")}}]},
+        {"portfolios": [{"weights": {"IBE.MC": float("nan")}}]},
+        {"portfolios": [{"profile": "agresivo_crypto"}], "capital": 1e308},
+        {"portfolios": [{"profile": "agresivo_crypto"}], "capital": float("inf")},
+    ],
+)
+def test_invalid_requests_are_rejected(payload):
+    # Sent as raw JSON so non-finite numbers reach validation as they would
+    # from a client; the response must be a 4xx, never a 500.
+    response = TestClient(app).post(
+        "/api/stress", content=json.dumps(payload), headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code in (400, 422)
+
+
+def test_request_size_is_capped():
+    portfolios = [{"profile": "agresivo_crypto"}] * 5000
+    simulations = STRESS_MAX_CELLS // 5000 + 1
+    with pytest.raises(HTTPException) as exc_info:
+        run_stress_test(StressRequest(portfolios=portfolios, simulations=simulations))
+    assert exc_info.value.status_code == 400